@@ -1,17 +1,91 @@
-from typing import List, Literal, Optional
+import io
+import sys
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 import h5py
 import numpy as np
 
+# Arrays with more elements than this are summarized with "..." instead of being
+# expanded into one Python object per element by tolist()
+_ARRAY_SUMMARY_THRESHOLD = 1000
+
+# Datasets up to this size are read whole for "uniform" sampling; larger ones
+# read only the sampled rows
+_FULL_READ_BYTES = 64 * 1024 * 1024
+
+# Header of every dataset's Properties section, filled with
+# (heading marks, shape, dtype, size)
+_DATASET_HDR = (
+    "{} Properties\n"
+    "\n"
+    "- **Shape:** `{}`\n"
+    "- **Data Type:** `{}`\n"
+    "- **Size:** `{}` elements\n"
+)
+
+
+def _scalar_str(value: Any) -> str:
+    """Format a numpy scalar as the equivalent Python scalar."""
+    return str(value.item())
+
+
+def _array_str(value: np.ndarray) -> str:
+    """Format an array as a list, eliding the middle of large arrays."""
+    if value.size <= _ARRAY_SUMMARY_THRESHOLD:
+        return str(value.tolist())
+    text = np.array2string(
+        value,
+        separator=", ",
+        threshold=_ARRAY_SUMMARY_THRESHOLD,
+        max_line_width=sys.maxsize,
+        # Render numbers and bools the way tolist() would, so only the elision
+        # differs from small arrays: numpy's own printing pads every element
+        # to a common width, keeps 8 float digits by default and writes 1.0
+        # as "1."
+        formatter={
+            "bool": lambda v: str(v.item()),
+            "int_kind": lambda v: str(v.item()),
+            "float_kind": lambda v: repr(float(v)),
+            "complex_kind": lambda v: repr(complex(v)),
+        },
+    )
+    # Keep multi-dimensional summaries on one line
+    return text.replace("\n", "")
+
+
+# Exact-type formatters for the values h5py hands back most often; one dict
+# lookup replaces the isinstance chain in HDF5Converter._format_value
+_FORMATTERS: Dict[type, Callable[[Any], str]] = {
+    str: str,
+    bytes: lambda value: value.decode("utf-8", "replace"),
+    np.ndarray: _array_str,
+    np.float64: _scalar_str,
+    np.float32: _scalar_str,
+    np.int64: _scalar_str,
+    np.int32: _scalar_str,
+}
+
 
 class HDF5Converter:
     """Convert HDF5 files to markdown format with AI-friendly key-value output."""
 
-    _output_lines: List[str]
+    _out: TextIO
     _max_rows: Optional[int]
     _max_cols: Optional[int]
     _sampling_strategy: Literal["first", "uniform", "edges"]
     _include_data_preview: bool
+    _chunk_cache_bytes: int
 
     def __init__(
         self,
@@ -19,6 +93,7 @@ class HDF5Converter:
         max_cols: Optional[int] = None,
         sampling_strategy: Literal["first", "uniform", "edges"] = "first",
         include_data_preview: bool = True,
+        chunk_cache_bytes: int = 8 * 1024 * 1024,
     ) -> None:
         """Initialize the HDF5 converter.
 
@@ -32,23 +107,50 @@ class HDF5Converter:
                 - "uniform": Sample uniformly across the dataset
                 - "edges": Show first and last items with "..." in between
             include_data_preview: Whether to include actual data values in output.
+            chunk_cache_bytes: Size of the HDF5 raw-data chunk cache per dataset.
+                     Chunks larger than the cache bypass it and are decompressed
+                     again for every preview read that touches them.
         """
-        self._output_lines = []
+        self._out = io.StringIO()
         self._max_rows = max_rows
         self._max_cols = max_cols
         self._sampling_strategy = sampling_strategy
         self._include_data_preview = include_data_preview
+        self._chunk_cache_bytes = chunk_cache_bytes
+
+    def _write_line(self, line: str) -> None:
+        """Write one line of markdown to the current output stream.
+
+        Each line is preceded by a newline instead of followed by one, so the
+        document does not end with an extra blank line.
+        """
+        self._out.write("\n")
+        self._out.write(line)
 
     def _format_value(self, value: object) -> str:
         """Format a value for markdown output."""
+        formatter = _FORMATTERS.get(type(value))
+        if formatter is not None:
+            return formatter(value)
         if isinstance(value, (np.integer, np.floating)):
             return str(value.item())
         elif isinstance(value, np.ndarray):
-            return str(value.tolist())
+            return _array_str(value)
         elif isinstance(value, bytes):
-            return value.decode("utf-8")
+            return value.decode("utf-8", "replace")
         return str(value)
 
+    def _format_values(self, data: np.ndarray) -> List[str]:
+        """Format every element of a 1-D array for markdown output.
+
+        Plain numeric arrays are converted to Python scalars with a single
+        ``tolist()`` call, which yields the same text as ``_format_value`` without
+        a Python-level type dispatch per element.
+        """
+        if data.dtype.kind in "biuf":
+            return [str(val) for val in data.tolist()]
+        return [self._format_value(val) for val in data]
+
     def _subset_array(self, arr: np.ndarray, axis: int, limit: int) -> np.ndarray:
         """Subset an array along a specific axis based on sampling strategy.
 
@@ -64,18 +166,133 @@ class HDF5Converter:
         if size <= limit:
             return arr
 
-        if self._sampling_strategy == "first":
-            indices = np.arange(limit)
-        elif self._sampling_strategy == "uniform":
+        if self._sampling_strategy == "uniform":
             indices = np.linspace(0, size - 1, limit, dtype=int)
-        else:  # "edges"
-            # Take half from start, half from end
-            half = limit // 2
-            start_indices = np.arange(half)
-            end_indices = np.arange(size - (limit - half), size)
-            indices = np.concatenate([start_indices, end_indices])
+            return np.take(arr, indices, axis=axis)
+
+        # Contiguous ranges are sliced (a view) rather than gathered with np.take
+        head = [slice(None)] * arr.ndim
+        if self._sampling_strategy == "first":
+            head[axis] = slice(0, limit)
+            return arr[tuple(head)]
+
+        # "edges": Take half from start, half from end
+        half = limit // 2
+        tail = list(head)
+        head[axis] = slice(0, half)
+        tail[axis] = slice(size - (limit - half), size)
+        return np.concatenate([arr[tuple(head)], arr[tuple(tail)]], axis=axis)
+
+    def _memmap(self, dataset: h5py.Dataset) -> Optional[np.ndarray]:
+        """Map a contiguous, unfiltered dataset straight from the HDF5 file.
+
+        The operating system then pages in only the bytes that sampling touches
+        instead of libhdf5 copying the whole dataset into a new buffer.
+
+        Args:
+            dataset: HDF5 dataset to map
+
+        Returns:
+            Read-only memory-mapped array, or None when the raw bytes cannot be
+            mapped (chunked/compact/virtual layout, external storage,
+            unallocated space, object dtypes, stored types that need libhdf5
+            conversion, user blocks or non-default drivers)
+        """
+        if dataset.dtype.hasobject or dataset.external is not None:
+            return None
+        # The raw bytes are only valid as dataset.dtype when the stored type is
+        # exactly what h5py would write for it (not e.g. a 12-bit integer)
+        if not dataset.id.get_type().equal(h5py.h5t.py_create(dataset.dtype)):
+            return None
+        if dataset.id.get_create_plist().get_layout() != h5py.h5d.CONTIGUOUS:
+            return None
+        f = dataset.file
+        if f.driver != "sec2" or f.userblock_size != 0:
+            return None
+        offset = dataset.id.get_offset()
+        if offset is None:
+            return None
+        return np.memmap(
+            f.filename,
+            dtype=dataset.dtype,
+            mode="r",
+            offset=offset,
+            shape=dataset.shape,
+        )
+
+    def _sample_selections(
+        self, size: int, limit: Optional[int]
+    ) -> List[Union[slice, np.ndarray]]:
+        """Build the HDF5 selections that cover a sampled axis.
+
+        Mirrors ``_subset_array`` so the sampled items can be read directly from
+        the file: contiguous ranges become slices (fast hyperslab reads) and
+        only "uniform" needs an index list.
+
+        Args:
+            size: Length of the axis on disk
+            limit: Maximum number of elements to keep along this axis
+
+        Returns:
+            Selections whose concatenation holds the sampled items
+        """
+        if limit is None or size <= limit:
+            return [slice(None)]
+        if self._sampling_strategy == "first":
+            return [slice(0, limit)]
+        if self._sampling_strategy == "uniform":
+            # Strictly increasing since size > limit, as h5py requires
+            return [np.linspace(0, size - 1, limit, dtype=int)]
+        half = limit // 2
+        return [slice(0, half), slice(size - (limit - half), size)]
+
+    def _read_preview(self, dataset: h5py.Dataset) -> np.ndarray:
+        """Read the part of a dataset needed for its data preview.
+
+        Only the sampled rows and columns are selected, so libhdf5 reads and
+        decompresses just the chunks overlapping the preview instead of
+        materializing the whole dataset: "edges" becomes contiguous head/tail
+        hyperslabs and "uniform" a single index-list read along the rows.
+        Contiguous datasets are memory-mapped instead, and small datasets
+        sampled uniformly are read whole and sampled in memory, which beats a
+        scattered point selection.
+
+        Args:
+            dataset: HDF5 dataset to read
 
-        return np.take(arr, indices, axis=axis)
+        Returns:
+            Numpy array holding (at least) the values to preview
+        """
+        # Null-dataspace datasets (h5py.Empty) have no shape to select from
+        if dataset.shape is None:
+            return np.asarray(dataset[()])
+
+        if self._sampling_strategy != "first":
+            mapped = self._memmap(dataset)
+            if mapped is not None:
+                return mapped
+            uniform = self._sampling_strategy == "uniform"
+            if uniform and dataset.nbytes <= _FULL_READ_BYTES:
+                return np.asarray(dataset[()])
+
+        # Column selections (plus full trailing axes) for each row block. h5py
+        # allows only one index list per selection, and uniform column samples
+        # always span the first to the last column, so uniform columns are read
+        # in full and sampled in memory afterwards
+        trailing: List[Tuple[slice, ...]] = [()]
+        if dataset.ndim >= 2:
+            rest = (slice(None),) * (dataset.ndim - 2)
+            trailing = []
+            for cols in self._sample_selections(dataset.shape[1], self._max_cols):
+                if isinstance(cols, np.ndarray):
+                    cols = slice(None)
+                trailing.append((cols, *rest))
+
+        blocks = []
+        for rows in self._sample_selections(dataset.shape[0], self._max_rows):
+            parts = [np.asarray(dataset[(rows, *cols)]) for cols in trailing]
+            blocks.append(parts[0] if len(parts) == 1 else np.concatenate(parts, 1))
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
 
     def _format_dataset_values(self, dataset: h5py.Dataset) -> str:
         """Format dataset values as key-value pairs for AI consumption.
@@ -87,28 +304,25 @@ class HDF5Converter:
             Formatted string representation
         """
         try:
-            # Load the data
-            data = dataset[()]
-
             # Handle scalar values
             if dataset.shape == ():
-                return f"**Value:** `{self._format_value(data)}`"
+                return f"**Value:** `{self._format_value(dataset[()])}`"
 
-            # Convert to numpy array if needed
-            if not isinstance(data, np.ndarray):
-                data = np.array(data)
+            # Load only what the preview needs
+            data = self._read_preview(dataset)
 
-            # Apply subsetting if limits are set
+            # Apply subsetting if limits are set (truncation is judged against
+            # the on-disk shape since the read may already be bounded)
             truncated_rows = False
             truncated_cols = False
 
             if self._max_rows is not None and len(data.shape) >= 1:
-                if data.shape[0] > self._max_rows:
+                if dataset.shape[0] > self._max_rows:
                     data = self._subset_array(data, 0, self._max_rows)
                     truncated_rows = True
 
             if self._max_cols is not None and len(data.shape) >= 2:
-                if data.shape[1] > self._max_cols:
+                if dataset.shape[1] > self._max_cols:
                     data = self._subset_array(data, 1, self._max_cols)
                     truncated_cols = True
 
@@ -119,8 +333,10 @@ class HDF5Converter:
             if len(data.shape) == 1:
                 result.append("**Data (Key-Value Format):**")
                 result.append("")
-                for i, val in enumerate(data):
-                    result.append(f"- `index_{i}`: `{self._format_value(val)}`")
+                result.extend(
+                    f"- `index_{i}`: `{val}`"
+                    for i, val in enumerate(self._format_values(data))
+                )
                 if truncated_rows:
                     orig_shape = dataset.shape
                     msg = (
@@ -135,8 +351,10 @@ class HDF5Converter:
                 result.append("")
                 for i, row in enumerate(data):
                     result.append(f"- **Row {i}:**")
-                    for j, val in enumerate(row):
-                        result.append(f"  - `col_{j}`: `{self._format_value(val)}`")
+                    result.extend(
+                        f"  - `col_{j}`: `{val}`"
+                        for j, val in enumerate(self._format_values(row))
+                    )
                 if truncated_rows or truncated_cols:
                     orig_shape = dataset.shape
                     msg = f"- *(showing {data.shape[0]} of {orig_shape[0]} rows"
@@ -151,13 +369,14 @@ class HDF5Converter:
                 result.append("")
                 result.append(f"- **Sample shape:** `{data.shape}`")
                 result.append("- **Flattened preview (first 20 values):**")
-                flat = data.flatten()[:20]
-                for i, val in enumerate(flat):
-                    result.append(f"  - `element_{i}`: `{self._format_value(val)}`")
-                if len(data.flatten()) > 20:
-                    result.append(
-                        f"  - *(showing 20 of {len(data.flatten())} total elements)*"
-                    )
+                # data.flat copies just the leading values, never the whole array
+                flat = data.flat[:20]
+                result.extend(
+                    f"  - `element_{i}`: `{val}`"
+                    for i, val in enumerate(self._format_values(flat))
+                )
+                if data.size > 20:
+                    result.append(f"  - *(showing 20 of {data.size} total elements)*")
 
             return "\n".join(result)
 
@@ -173,91 +392,127 @@ class HDF5Converter:
 
         # Dynamic header for Attributes based on depth
         attr_header = "#" * header_level + " Attributes"
-        self._output_lines.append(attr_header)
-        self._output_lines.append("")
 
-        for key, value in item.attrs.items():
-            formatted_value = self._format_value(value)
-            value_type = type(value).__name__
-            self._output_lines.append(
-                f"- **{key}:** `{formatted_value}` (type: `{value_type}`)"
-            )
-        self._output_lines.append("")
+        # Format every row straight into one string and write the section once
+        rows = "".join(
+            f"- **{key}:** `{self._format_value(value)}` "
+            f"(type: `{type(value).__name__}`)\n"
+            for key, value in item.attrs.items()
+        )
+        self._write_line(f"{attr_header}\n\n{rows}")
 
     def _process_dataset(self, dataset: h5py.Dataset, header_level: int) -> None:
         """Process an HDF5 dataset with key-value format."""
-        # Dataset Properties in key-value format
-        prop_header = "#" * (header_level + 1) + " Properties"
-        self._output_lines.append(prop_header)
-        self._output_lines.append("")
-
-        # Basic properties
-        self._output_lines.append(f"- **Shape:** `{dataset.shape}`")
-        self._output_lines.append(f"- **Data Type:** `{dataset.dtype}`")
-        self._output_lines.append(f"- **Size:** `{dataset.size}` elements")
+        # Dataset Properties in key-value format, built as one block so the
+        # whole section costs a single write
+        properties = _DATASET_HDR.format(
+            "#" * (header_level + 1), dataset.shape, dataset.dtype, dataset.size
+        )
 
         if dataset.compression:
-            self._output_lines.append(f"- **Compression:** `{dataset.compression}`")
+            properties += f"- **Compression:** `{dataset.compression}`\n"
 
         # Add chunks info if available
         if dataset.chunks:
-            self._output_lines.append(f"- **Chunks:** `{dataset.chunks}`")
+            properties += f"- **Chunks:** `{dataset.chunks}`\n"
 
-        self._output_lines.append("")
+        self._write_line(properties)
 
         # Include data preview if enabled
         if self._include_data_preview:
-            self._output_lines.append(self._format_dataset_values(dataset))
-            self._output_lines.append("")
+            self._write_line(self._format_dataset_values(dataset))
+            self._write_line("")
 
         # Process dataset attributes
         self._process_attributes(dataset, header_level + 1)
 
-    def _process_group(self, group: h5py.Group, level: int = 1) -> None:
-        """Process an HDF5 group."""
+    def _open_group(self, group: h5py.Group, level: int) -> None:
+        """Write a group's heading and attributes."""
         if level > 1:
             header = "\n" + "#" * level + " Group: " + group.name
-            self._output_lines.append(header)
-            self._output_lines.append("")  # Blank line after heading
+            self._write_line(header)
+            self._write_line("")  # Blank line after heading
 
         # Pass group level to attributes for dynamic header
         self._process_attributes(group, level + 1)
 
-        for name in group.keys():
+    def _process_group(self, group: h5py.Group, level: int = 1) -> None:
+        """Process an HDF5 group and everything below it.
+
+        The hierarchy is walked depth-first with an explicit stack of child
+        iterators instead of recursion, so output order is unchanged but deeply
+        nested files cannot exceed the interpreter's recursion limit.
+        """
+        self._open_group(group, level)
+
+        stack: List[Tuple[h5py.Group, int, Iterator[str]]] = [
+            (group, level, iter(group.keys()))
+        ]
+        while stack:
+            parent, parent_level, names = stack[-1]
+            name = next(names, None)
+            if name is None:
+                stack.pop()
+                continue
+            child_level = parent_level + 1
+
             # Check for external link before accessing the item
             # get_external() returns (filename, path) tuple for external links
-            link_info = group.get(name, getlink=True)
+            link_info = parent.get(name, getlink=True)
 
             if isinstance(link_info, h5py.ExternalLink):
-                header = "\n" + "#" * (level + 1) + " External Link: " + name
-                self._output_lines.append(header)
-                self._output_lines.append("")  # Blank line after heading
-                self._output_lines.append(f"- **Target File:** `{link_info.filename}`")
-                self._output_lines.append(f"- **Target Path:** `{link_info.path}`")
-                self._output_lines.append("")  # Blank line after details
+                header = "\n" + "#" * child_level + " External Link: " + name
+                self._write_line(header)
+                self._write_line("")  # Blank line after heading
+                self._write_line(f"- **Target File:** `{link_info.filename}`")
+                self._write_line(f"- **Target Path:** `{link_info.path}`")
+                self._write_line("")  # Blank line after details
+            elif isinstance(link_info, h5py.SoftLink):
+                # Describe soft links from the link itself instead of following
+                # them: the target is rendered where it lives, so its data is
+                # not read twice, and dangling links cannot abort the conversion
+                header = "\n" + "#" * child_level + " Soft Link: " + name
+                self._write_line(header)
+                self._write_line("")  # Blank line after heading
+                self._write_line(f"- **Target Path:** `{link_info.path}`")
+                self._write_line("")  # Blank line after details
             else:
                 # Now access the actual item
-                item = group[name]
+                item = parent[name]
                 if isinstance(item, h5py.Dataset):
-                    header = "\n" + "#" * (level + 1) + " Dataset: " + name
-                    self._output_lines.append(header)
-                    self._output_lines.append("")  # Blank line after heading
+                    header = "\n" + "#" * child_level + " Dataset: " + name
+                    self._write_line(header)
+                    self._write_line("")  # Blank line after heading
                     # Pass dataset header level to process properties
-                    self._process_dataset(item, level + 1)
+                    self._process_dataset(item, child_level)
                 elif isinstance(item, h5py.Group):
-                    self._process_group(item, level + 1)
+                    # Descend: the subgroup is finished before its parent resumes
+                    self._open_group(item, child_level)
+                    stack.append((item, child_level, iter(item.keys())))
 
-    def convert(self, file_path: str, output_path: Optional[str] = None) -> str:
-        """Convert an HDF5 file to markdown format."""
-        self._output_lines = []
-        header = f"# HDF5 File Structure: {file_path}\n"
-        self._output_lines.append(header)
-        self._output_lines.append("")  # Blank line after heading
+    def write_markdown(self, file_path: str, out: TextIO) -> None:
+        """Stream the markdown for an HDF5 file into a text stream.
+
+        Unlike ``convert``, the document is never held in memory as a whole, so
+        memory use stays flat regardless of how large the output grows.
 
-        with h5py.File(file_path, "r") as f:
+        Args:
+            file_path: HDF5 file to convert
+            out: Writable text stream receiving the markdown
+        """
+        self._out = out
+        # The title is the first line, so it is not preceded by a separator
+        out.write(f"# HDF5 File Structure: {file_path}\n")
+        self._write_line("")  # Blank line after heading
+
+        with h5py.File(file_path, "r", rdcc_nbytes=self._chunk_cache_bytes) as f:
             self._process_group(f)
 
-        markdown_content = "\n".join(self._output_lines)
+    def convert(self, file_path: str, output_path: Optional[str] = None) -> str:
+        """Convert an HDF5 file to markdown format."""
+        buffer = io.StringIO()
+        self.write_markdown(file_path, buffer)
+        markdown_content = buffer.getvalue()
 
         if output_path:
             with open(output_path, "w") as f:
@@ -1,21 +1,66 @@
 import argparse
+import os
 import sys
+from multiprocessing import Pool
 from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from h5md import HDF5Converter
 
 
+def _convert_one(task: Tuple[str, str, Dict[str, Any]]) -> Optional[str]:
+    """Convert a single HDF5 file, returning an error message on failure.
+
+    Runs inside worker processes, so each call builds its own converter and no
+    open HDF5 file is ever shared between processes.
+    """
+    file_path, output_path, options = task
+    # Stream into a sibling file and move it into place only once the whole
+    # document is written, so a failed conversion never leaves a truncated
+    # output behind or clobbers the previous one
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        converter = HDF5Converter(**options)
+        # A 1 MiB buffer keeps the many small markdown writes from turning
+        # into one syscall per 8 KiB
+        with open(tmp_path, "w", buffering=1 << 20) as out:
+            converter.write_markdown(file_path, out)
+        os.replace(tmp_path, output_path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return str(e)
+    return None
+
+
+def _report(
+    tasks: List[Tuple[str, str, Dict[str, Any]]], errors: Iterable[Optional[str]]
+) -> bool:
+    """Print one status line per conversion as it finishes; True if any failed."""
+    failed = False
+    for (file_path, output_path, _), error in zip(tasks, errors):
+        if error is None:
+            print(f"Successfully converted {file_path} to {output_path}")
+        else:
+            print(f"Error: {file_path}: {error}", file=sys.stderr)
+            failed = True
+    return failed
+
+
 def main() -> None:
     """Command-line interface for HDF5 to markdown converter."""
     parser = argparse.ArgumentParser(
         description="Convert HDF5 files to AI-friendly markdown format with key-value structure"
     )
-    parser.add_argument("file", help="HDF5 file to convert")
+    parser.add_argument(
+        "files", nargs="+", metavar="file", help="HDF5 file(s) to convert"
+    )
     parser.add_argument(
         "-o",
         "--output",
         help=(
-            "Output markdown file path " "(defaults to input file with .md extension)"
+            "Output markdown file path, only valid with a single input file "
+            "(defaults to input file with .md extension)"
         ),
         default=None,
     )
@@ -47,34 +92,63 @@ def main() -> None:
         action="store_true",
         help="Exclude actual data values from output (metadata only)",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files to convert in parallel (default: 1, use 0 for all CPUs)",
+    )
     args = parser.parse_args()
 
-    # Check if input file exists
-    if not Path(args.file).is_file():
-        msg = ("Error: Input file '{}' does not exist").format(args.file)
+    if args.output is not None and len(args.files) > 1:
+        parser.error("-o/--output can only be used with a single input file")
+    if args.jobs < 0:
+        parser.error("-j/--jobs must be 0 or a positive number")
+
+    # Check if input files exist
+    missing = [file for file in args.files if not Path(file).is_file()]
+    for file in missing:
+        msg = ("Error: Input file '{}' does not exist").format(file)
         print(msg, file=sys.stderr)
+    if missing:
         sys.exit(1)
 
-    try:
-        # If no output path is specified, use input path with .md extension
-        output_path = args.output
-        if output_path is None:
-            output_path = str(Path(args.file).with_suffix(".md"))
-
-        # Convert 0 to None (meaning no limit)
-        max_rows = None if args.max_rows == 0 else args.max_rows
-        max_cols = None if args.max_cols == 0 else args.max_cols
-
-        converter = HDF5Converter(
-            max_rows=max_rows,
-            max_cols=max_cols,
-            sampling_strategy=args.sampling,
-            include_data_preview=not args.no_data,
-        )
-        converter.convert(args.file, output_path)
-        print(f"Successfully converted {args.file} to {output_path}")
-    except Exception as e:
-        print(f"Error: {str(e)}", file=sys.stderr)
+    # Convert 0 to None (meaning no limit)
+    options: Dict[str, Any] = {
+        "max_rows": None if args.max_rows == 0 else args.max_rows,
+        "max_cols": None if args.max_cols == 0 else args.max_cols,
+        "sampling_strategy": args.sampling,
+        "include_data_preview": not args.no_data,
+    }
+
+    # If no output path is specified, use input path with .md extension
+    tasks = [
+        (file, args.output or str(Path(file).with_suffix(".md")), options)
+        for file in args.files
+    ]
+
+    # Two inputs mapping to one output would silently overwrite each other
+    outputs: Dict[str, str] = {}
+    for file_path, output_path, _ in tasks:
+        key = os.path.realpath(output_path)
+        if key in outputs:
+            parser.error(
+                f"'{outputs[key]}' and '{file_path}' would both be written to "
+                f"'{output_path}'"
+            )
+        outputs[key] = file_path
+
+    # HDF5 serializes calls within a process, so files are converted in
+    # separate worker processes rather than threads; imap hands results back
+    # (in input order) as files finish instead of after the whole batch
+    jobs = min(args.jobs or os.cpu_count() or 1, len(tasks))
+    if jobs > 1:
+        with Pool(jobs) as pool:
+            failed = _report(tasks, pool.imap(_convert_one, tasks))
+    else:
+        failed = _report(tasks, map(_convert_one, tasks))
+    if failed:
         sys.exit(1)
 
 
@@ -5,9 +5,11 @@ import pytest
 from h5md import HDF5Converter
 
 
-@pytest.fixture
-def sample_hdf5_file(tmp_path):
+# The fixture files are only ever read, so they are built once per session
+@pytest.fixture(scope="session")
+def sample_hdf5_file(tmp_path_factory):
     """Create a sample HDF5 file for testing"""
+    tmp_path = tmp_path_factory.mktemp("sample")
     file_path = tmp_path / "test.h5"
 
     with h5py.File(file_path, "w") as f:
@@ -35,10 +37,10 @@ def sample_hdf5_file(tmp_path):
     return file_path
 
 
-@pytest.fixture
-def large_hdf5_file(tmp_path):
+@pytest.fixture(scope="session")
+def large_hdf5_file(tmp_path_factory):
     """Create a large HDF5 file for testing subsetting"""
-    file_path = tmp_path / "large_test.h5"
+    file_path = tmp_path_factory.mktemp("large") / "large_test.h5"
 
     with h5py.File(file_path, "w") as f:
         # Create large 1D array
@@ -76,19 +78,25 @@ def test_hdf5_external_link_conversion(sample_hdf5_file):
     assert "/linked_data" in result
 
 
-def test_cli_basic(sample_hdf5_file):
+def test_cli_basic(sample_hdf5_file, tmp_path):
+    import shutil
     import sys
 
     from h5md.cli import main
 
+    # The default output lands next to the input, so convert a private copy
+    # rather than writing beside the shared session fixture
+    input_file = tmp_path / sample_hdf5_file.name
+    shutil.copy(sample_hdf5_file, input_file)
+
     # Prepare command line arguments
-    sys.argv = ["h5md", str(sample_hdf5_file)]
+    sys.argv = ["h5md", str(input_file)]
 
     # Run CLI (should create output file)
     main()
 
     # Check if output file exists
-    output_file = sample_hdf5_file.with_suffix(".md")
+    output_file = input_file.with_suffix(".md")
     assert output_file.exists()
 
     # Check content
@@ -219,3 +227,323 @@ def test_cli_no_data_flag(sample_hdf5_file, tmp_path):
     # Should have properties but not data values
     assert "Properties" in content
     assert "Data (Key-Value Format):" not in content
+
+
+def test_write_markdown_stream(sample_hdf5_file):
+    """Test streaming markdown into a text stream"""
+    import io
+
+    converter = HDF5Converter()
+    out = io.StringIO()
+    converter.write_markdown(str(sample_hdf5_file), out)
+
+    assert out.getvalue() == converter.convert(str(sample_hdf5_file))
+    assert "Test HDF5 file" in out.getvalue()
+
+
+def test_uniform_sampling_values(tmp_path):
+    """Test sampled values for contiguous and chunked storage"""
+    file_path = tmp_path / "layouts.h5"
+    with h5py.File(file_path, "w") as f:
+        f.create_dataset("contiguous", data=np.arange(100))
+        f.create_dataset(
+            "chunked", data=np.arange(100), chunks=(10,), compression="gzip"
+        )
+
+    converter = HDF5Converter(max_rows=5, sampling_strategy="uniform")
+    result = converter.convert(str(file_path))
+
+    # np.linspace(0, 99, 5) -> 0, 24, 49, 74, 99 for both layouts
+    assert result.count("`index_1`: `24`") == 2
+    assert result.count("`index_4`: `99`") == 2
+
+
+def test_sampling_converts_non_native_types(tmp_path):
+    """Test that stored types needing conversion are not read as raw bytes"""
+    file_path = tmp_path / "packed.h5"
+    with h5py.File(file_path, "w") as f:
+        # A 12-bit integer stored at bit offset 2 of a 16-bit word
+        tid = h5py.h5t.STD_I16LE.copy()
+        tid.set_precision(12)
+        tid.set_offset(2)
+        space = h5py.h5s.create_simple((30,))
+        dsid = h5py.h5d.create(f.id, b"packed", tid, space)
+        h5py.Dataset(dsid)[...] = np.arange(30, dtype=np.int16)
+
+    expected = {
+        "first": [0, 1, 2, 3],
+        "uniform": [0, 9, 19, 29],
+        "edges": [0, 1, 28, 29],
+    }
+    for strategy, values in expected.items():
+        converter = HDF5Converter(max_rows=4, sampling_strategy=strategy)
+        result = converter.convert(str(file_path))
+
+        for i, value in enumerate(values):
+            assert f"`index_{i}`: `{value}`" in result
+
+
+def test_soft_link_conversion(tmp_path):
+    """Test that soft links are described, not followed"""
+    file_path = tmp_path / "soft.h5"
+    with h5py.File(file_path, "w") as f:
+        f.create_dataset("target", data=np.arange(3))
+        f["alias"] = h5py.SoftLink("/target")
+        f["dangling"] = h5py.SoftLink("/nowhere")
+
+    converter = HDF5Converter()
+    result = converter.convert(str(file_path))
+
+    assert "Soft Link: alias" in result
+    assert "Soft Link: dangling" in result
+    assert "`/nowhere`" in result
+    # The target's data is rendered once, under its own name
+    assert result.count("Data (Key-Value Format):") == 1
+
+
+def test_creation_order_preserved(tmp_path):
+    """Test that order-tracked groups render in creation order"""
+    file_path = tmp_path / "ordered.h5"
+    with h5py.File(file_path, "w", track_order=True) as f:
+        f.create_dataset("zeta", data=np.arange(2))
+        f.create_dataset("alpha", data=np.arange(2))
+
+    result = HDF5Converter().convert(str(file_path))
+
+    assert result.index("Dataset: zeta") < result.index("Dataset: alpha")
+
+
+def test_large_array_attribute_summarized(tmp_path):
+    """Test that large array attributes are summarized, small ones kept whole"""
+    file_path = tmp_path / "attrs.h5"
+    with h5py.File(file_path, "w") as f:
+        f.attrs["small"] = np.arange(4)
+        f.attrs["large"] = np.arange(5000).reshape(50, 100)
+
+    result = HDF5Converter().convert(str(file_path))
+
+    assert "`[0, 1, 2, 3]`" in result
+    large_line = next(line for line in result.splitlines() if "**large:**" in line)
+    assert "`[[0, 1, 2, ..., 97, 98, 99], [100, 101, 102, ..." in large_line
+    assert ", 4997, 4998, 4999]]`" in large_line
+    assert "2500" not in result
+
+
+def test_deeply_nested_groups(tmp_path):
+    """Test nesting deeper than the interpreter's recursion limit"""
+    import sys
+
+    depth = sys.getrecursionlimit() + 10
+    file_path = tmp_path / "deep.h5"
+    with h5py.File(file_path, "w") as f:
+        f.create_group("/".join(["g"] * depth))
+
+    result = HDF5Converter().convert(str(file_path))
+
+    assert result.count(" Group: ") == depth
+
+
+def test_edges_sampling_values(tmp_path):
+    """Test that 'edges' reads the head and tail of chunked datasets"""
+    file_path = tmp_path / "edges.h5"
+    with h5py.File(file_path, "w") as f:
+        f.create_dataset("chunked", data=np.arange(100), chunks=(10,))
+
+    converter = HDF5Converter(max_rows=6, sampling_strategy="edges")
+    result = converter.convert(str(file_path))
+
+    assert "`index_2`: `2`" in result
+    assert "`index_3`: `97`" in result
+    assert "`index_5`: `99`" in result
+    assert "showing 6 of 100 rows" in result
+
+
+def test_no_data_preview_skips_reads(tmp_path):
+    """Test that metadata-only conversion never reads dataset values"""
+    raw_path = tmp_path / "raw.bin"
+    raw_path.write_bytes(np.arange(10, dtype="<i4").tobytes())
+    file_path = tmp_path / "external_storage.h5"
+    with h5py.File(file_path, "w") as f:
+        f.create_dataset(
+            "values", shape=(10,), dtype="<i4", external=[(str(raw_path), 0, 40)]
+        )
+    # Any attempt to read the values now fails
+    raw_path.unlink()
+
+    assert "Unable to load data" in HDF5Converter().convert(str(file_path))
+
+    converter = HDF5Converter(include_data_preview=False)
+    result = converter.convert(str(file_path))
+    assert "Dataset: values" in result
+    assert "Unable to load data" not in result
+
+
+def test_chunk_cache_option(large_hdf5_file, monkeypatch):
+    """Test that the chunk cache size reaches libhdf5 without changing output"""
+    cache_sizes = []
+    real_file = h5py.File
+
+    def recording_file(*args, **kwargs):
+        f = real_file(*args, **kwargs)
+        cache_sizes.append(f.id.get_access_plist().get_cache()[2])
+        return f
+
+    monkeypatch.setattr(h5py, "File", recording_file)
+
+    default = HDF5Converter(max_rows=5).convert(str(large_hdf5_file))
+    tiny = HDF5Converter(max_rows=5, chunk_cache_bytes=0).convert(str(large_hdf5_file))
+
+    assert cache_sizes == [8 * 1024 * 1024, 0]
+    assert tiny == default
+
+
+def test_edges_sampling_columns(tmp_path):
+    """Test 'edges' column sampling on a chunked matrix"""
+    file_path = tmp_path / "edges_matrix.h5"
+    with h5py.File(file_path, "w") as f:
+        f.create_dataset("matrix", data=np.arange(300).reshape(30, 10), chunks=(4, 4))
+
+    converter = HDF5Converter(max_rows=2, max_cols=4, sampling_strategy="edges")
+    result = converter.convert(str(file_path))
+
+    last_row = result.split("**Row 1:**")[1]
+    assert "`col_0`: `290`" in last_row
+    assert "`col_2`: `298`" in last_row
+    assert "2 of 30 rows, 4 of 10 cols" in result
+
+
+def test_external_link_target_not_opened(tmp_path):
+    """Test that external links are described without opening the target"""
+    file_path = tmp_path / "dangling_external.h5"
+    with h5py.File(file_path, "w") as f:
+        f["remote"] = h5py.ExternalLink("missing_target.h5", "/data")
+
+    result = HDF5Converter().convert(str(file_path))
+
+    assert "External Link: remote" in result
+    assert "`missing_target.h5`" in result
+    assert "`/data`" in result
+
+
+def test_cli_multiple_files_parallel(sample_hdf5_file, large_hdf5_file, tmp_path):
+    """Test converting several files in parallel worker processes"""
+    import shutil
+    import sys
+
+    from h5md.cli import main
+
+    inputs = [tmp_path / f.name for f in (sample_hdf5_file, large_hdf5_file)]
+    shutil.copy(sample_hdf5_file, inputs[0])
+    shutil.copy(large_hdf5_file, inputs[1])
+
+    sys.argv = ["h5md", *map(str, inputs), "--jobs", "2"]
+
+    main()
+
+    assert "Test HDF5 file" in inputs[0].with_suffix(".md").read_text()
+    assert "large_matrix" in inputs[1].with_suffix(".md").read_text()
+
+
+def test_cli_output_requires_single_file(sample_hdf5_file, large_hdf5_file, tmp_path):
+    """Test that -o is rejected when converting several files"""
+    import sys
+
+    from h5md.cli import main
+
+    output_file = tmp_path / "x.md"
+    sys.argv = [
+        "h5md",
+        str(sample_hdf5_file),
+        str(large_hdf5_file),
+        "-o",
+        str(output_file),
+    ]
+
+    with pytest.raises(SystemExit):
+        main()
+    assert not output_file.exists()
+
+
+def test_invalid_utf8_attribute(tmp_path):
+    """Test that undecodable byte attributes are rendered with replacements"""
+    file_path = tmp_path / "bytes.h5"
+    with h5py.File(file_path, "w") as f:
+        f.attrs["raw"] = np.bytes_(b"ok\xff")
+
+    result = HDF5Converter().convert(str(file_path))
+
+    assert "- **raw:** `ok�`" in result
+
+
+def test_cli_failed_conversion_leaves_no_output(tmp_path):
+    """Test that a failed conversion writes nothing and keeps the old output"""
+    import sys
+
+    from h5md.cli import main
+
+    bad_file = tmp_path / "bad.h5"
+    bad_file.write_text("x")
+    output_file = tmp_path / "bad.md"
+
+    sys.argv = ["h5md", str(bad_file)]
+    with pytest.raises(SystemExit):
+        main()
+    assert not output_file.exists()
+
+    output_file.write_text("previous")
+    with pytest.raises(SystemExit):
+        main()
+    assert output_file.read_text() == "previous"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["bad.h5", "bad.md"]
+
+
+def test_null_dataspace_dataset(tmp_path):
+    """Test that empty (null dataspace) datasets render for every strategy"""
+    file_path = tmp_path / "null.h5"
+    with h5py.File(file_path, "w") as f:
+        f.create_dataset("null", data=h5py.Empty("f"))
+
+    for strategy in ("first", "uniform", "edges"):
+        result = HDF5Converter(sampling_strategy=strategy).convert(str(file_path))
+
+        assert "Unable to load data" not in result
+        assert "`element_0`: `Empty(dtype=dtype('<f4'))`" in result
+
+
+def test_cli_rejects_colliding_outputs_and_negative_jobs(sample_hdf5_file, tmp_path):
+    """Test that inputs sharing an output path and negative --jobs are rejected"""
+    import shutil
+    import sys
+
+    from h5md.cli import main
+
+    other = tmp_path / "test.hdf5"
+    shutil.copy(sample_hdf5_file, other)
+    first = tmp_path / "test.h5"
+    shutil.copy(sample_hdf5_file, first)
+
+    for argv in (
+        [str(first), str(other)],
+        [str(first), str(first)],
+        [str(first), "--jobs", "-3"],
+    ):
+        sys.argv = ["h5md", *argv]
+        with pytest.raises(SystemExit):
+            main()
+
+    assert not (tmp_path / "test.md").exists()
+
+
+def test_large_float_attribute_keeps_precision(tmp_path):
+    """Test that summarized float and bool arrays print like small arrays do"""
+    file_path = tmp_path / "floats.h5"
+    with h5py.File(file_path, "w") as f:
+        f.attrs["large"] = np.full(2000, 0.123456789012345)
+        f.attrs["whole"] = np.ones(2000)
+        f.attrs["flags"] = np.ones(2000, dtype=bool)
+
+    result = HDF5Converter().convert(str(file_path))
+
+    assert "`[0.123456789012345, 0.123456789012345, 0.123456789012345, ..." in result
+    assert "`[1.0, 1.0, 1.0, ..., 1.0, 1.0, 1.0]`" in result
+    assert "`[True, True, True, ..., True, True, True]`" in result